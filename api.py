@@ -4,89 +4,281 @@ Simple Python Flask API - Connects C++ Backend with Frontend
 """
 
 from flask import Flask, jsonify, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import asyncio
+import contextlib
+import operator
 import subprocess
 import json
+import socket
 import sys
-import math
+import threading
+import time
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows; only needed alongside AF_UNIX anyway
+
+import decay_kernels
+
+# orjson is a native JSON implementation, several times faster than the
+# stdlib encoder on large concept lists; stdlib json is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 CORS(app)
 
+if orjson is not None:
+    class ORJSONProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson"""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
+
+# Decoder for C++ backend responses (accepts both str and bytes)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 # Handle Windows vs Unix executable extension
 if sys.platform == "win32":
     CPP_EXECUTABLE = "./memory_graph_app.exe"
 else:
     CPP_EXECUTABLE = "./memory_graph_app"
 
+# Unix domain socket for the persistent C++ daemon (started with --serve).
+# Talking to a long-lived process avoids fork/exec + linker startup per command.
+DAEMON_SOCKET_PATH = "/tmp/memory_graph.sock"
+DAEMON_LOCK_PATH = DAEMON_SOCKET_PATH + ".lock"
+_daemon_socket = None
+_daemon_proc = None  # Popen handle for a daemon this process spawned, kept for reaping
+# Long-lived child with stdin/stdout pipes: same startup-cost win as the
+# socket daemon, used where AF_UNIX is unavailable (Windows) or the socket
+# cannot be established
+_pipe_proc = None
+_daemon_lock = threading.Lock()  # One request/response frame on a persistent transport at a time
+
+# Serializes app_state mutations when running under a threaded/green-threaded
+# WSGI server (gunicorn -k gevent); reads of plain dict fields stay lock-free
+_state_lock = threading.Lock()
+
+# Decay rate used by the Python-side simulation, kept in sync with the C++
+# backend by /api/decay-rate. days_since_revision is always an integer, so
+# the lookup table caches exp(-rate * days) per rate change and simulate_time
+# does a table gather instead of computing exp per concept.
+DEFAULT_DECAY_RATE = 0.15
+_decay_rate = DEFAULT_DECAY_RATE
+_decay_table = decay_kernels.build_decay_table(_decay_rate)
+
 # In-memory state to persist between requests
 app_state = {
     "concepts": [],
+    "_by_id": {},  # id -> concept dict (shared references, O(1) lookups)
     "stats": {},
+    "_dirty": True,  # Set on mutation; derived stats/queue recompute lazily
+    "_rev": 0,  # Bumped on mutation; backs the ETag on GET responses
+    "_queue": [],  # Cached revision queue (concepts sorted by memory strength)
     "initialized": False
 }
 
-def calculate_days_since_revision(memory_strength, initial_weight, lambda_rate):
-    """Calculate days since last revision based on memory strength and decay rate"""
-    if initial_weight <= 0:
-        return 0  # Invalid initial weight
-    
-    # If memory equals or exceeds initial, assume it was recently revised
-    # But if memory is very low, assume it started higher and decayed
-    if memory_strength >= initial_weight:
-        # If memory is high (>= 0.9), it was just revised (0 days)
-        if memory_strength >= 0.9:
-            return 0
-        # Otherwise, assume it started at 1.0 and decayed slightly
-        initial_weight = 1.0
-    
-    # Formula: memory = initial * exp(-lambda * days)
-    # Solving for days: days = -ln(memory/initial) / lambda
-    ratio = memory_strength / initial_weight
-    if ratio <= 0:
-        return 999  # Very old (memory decayed to near zero)
-    
+# C-level field extractors for the hot rebuild path; every concept dict is
+# guaranteed to carry these keys by the time _rebuild_arrays runs (the C++
+# backend emits them and initialize_state/add_concept fill in the rest), so
+# itemgetter + map beats a Python comprehension doing dict.get per element
+_get_initial_weight = operator.itemgetter("initial_weight")
+_get_last_revised_day = operator.itemgetter("last_revised_day")
+_get_memory_strength = operator.itemgetter("memory_strength")
+
+def _rebuild_arrays():
+    """Sync the structure-of-arrays views with the concept dicts.
+
+    Numeric fields are mirrored into parallel NumPy arrays so hot paths
+    (decay, stats, queue sorting) run as vectorized passes instead of
+    per-concept Python loops. Call after any mutation of the concept list.
+    """
+    concepts = app_state["concepts"]
+    count = len(concepts)
+    app_state["_initial_weight"] = np.fromiter(
+        map(_get_initial_weight, concepts), dtype=np.float64, count=count)
+    app_state["_last_revised_day"] = np.fromiter(
+        map(_get_last_revised_day, concepts), dtype=np.float64, count=count)
+    app_state["_memory_strength"] = np.fromiter(
+        map(_get_memory_strength, concepts), dtype=np.float64, count=count)
+    app_state["_dirty"] = True
+    app_state["_rev"] += 1
+
+_rebuild_arrays()
+
+# Cross-worker shared segment so gunicorn workers see one state instead of
+# each initializing and mutating a private copy; per-process state is the
+# fallback if the segment cannot be created
+try:
+    import shared_state
+    _shared = shared_state.SharedConceptState()
+except (ImportError, OSError):
+    _shared = None
+app_state["_shared_rev"] = 0
+
+def _shared_write_lock():
+    """Cross-process write lock for a sync-mutate-publish cycle
+
+    Mutating handlers must hold this across the whole cycle; the locking
+    inside publish() alone only prevents torn frames, not lost updates
+    from two workers mutating concurrently. No-op when shared state is
+    inactive.
+    """
+    if _shared is not None:
+        return _shared.write_lock()
+    return contextlib.nullcontext()
+
+def _publish_shared():
+    """Push current arrays + metadata to the cross-worker segment
+
+    Callers must hold _state_lock.
+    """
+    if _shared is None:
+        return
     try:
-        days = -math.log(ratio) / lambda_rate
-        return max(0, int(round(days)))
-    except (ValueError, ZeroDivisionError):
-        return 0
+        app_state["_shared_rev"] = _shared.publish(
+            app_state["_initial_weight"], app_state["_last_revised_day"],
+            app_state["_memory_strength"],
+            {"concepts": app_state["concepts"], "stats": app_state["stats"],
+             "decay_rate": _decay_rate})
+    except (OSError, ValueError):
+        pass
+
+def _sync_shared_locked():
+    """Adopt state published by another worker if the revision moved
+
+    Callers must hold _state_lock. The shared arrays are the numeric truth;
+    values from the metadata snapshot are overwritten with them.
+    """
+    global _decay_rate, _decay_table
+    if _shared is None or _shared.rev == app_state["_shared_rev"]:
+        return
+    snapshot = _shared.snapshot()
+    if snapshot is None:
+        return
+    rev, initial, last_revised, memory, metadata = snapshot
+    concepts = metadata.get("concepts", [])
+    for concept, weight, day, strength in zip(concepts, initial, last_revised, memory):
+        concept["initial_weight"] = float(weight)
+        concept["last_revised_day"] = int(day)
+        concept["memory_strength"] = float(strength)
+    app_state["concepts"] = concepts
+    app_state["_by_id"] = {c.get("id"): c for c in concepts}
+    app_state["stats"] = metadata.get("stats", {})
+    shared_rate = metadata.get("decay_rate", _decay_rate)
+    if shared_rate != _decay_rate:
+        _decay_rate = shared_rate
+        _decay_table = decay_kernels.build_decay_table(shared_rate)
+    app_state["_initial_weight"] = initial
+    app_state["_last_revised_day"] = last_revised
+    app_state["_memory_strength"] = memory
+    app_state["_dirty"] = True
+    app_state["_rev"] += 1
+    app_state["_shared_rev"] = rev
+    app_state["initialized"] = True
+
+def _sync_shared():
+    """Locking wrapper around _sync_shared_locked for request handlers"""
+    if _shared is None or _shared.rev == app_state["_shared_rev"]:
+        return
+    with _state_lock:
+        _sync_shared_locked()
+
+def _current_etag():
+    """ETag for GET responses: changes exactly when the state mutates
+
+    The cross-worker shared revision is used when sharing is active so the
+    tag stays consistent no matter which worker answers a poll; otherwise
+    the local mutation counter serves the same purpose.
+    """
+    if _shared is not None:
+        return str(app_state["_shared_rev"])
+    return str(app_state["_rev"])
+
+def _not_modified(etag):
+    """True if the client already holds the current state"""
+    return request.if_none_match.contains(etag)
+
+def _refresh_derived():
+    """Recompute stats and the sorted revision queue if state changed.
+
+    Reads of /api/stats and /api/revision-queue far outnumber writes, so
+    both derived values are memoized and only rebuilt after a mutation
+    flips the dirty flag.
+    """
+    if not app_state["_dirty"]:
+        return
+    if app_state["concepts"]:
+        memory = app_state["_memory_strength"]
+        app_state["stats"]["totalConcepts"] = len(app_state["concepts"])
+        app_state["stats"]["avgMemory"] = memory.mean() * 100
+        app_state["stats"]["urgentCount"] = int((memory < 0.3).sum())
+        order = np.argsort(memory, kind="stable")
+        app_state["_queue"] = [app_state["concepts"][i] for i in order]
+    else:
+        app_state["_queue"] = []
+    app_state["_dirty"] = False
 
 def initialize_state():
     """Initialize state from C++ backend"""
-    if not app_state["initialized"]:
+    if app_state["initialized"]:
+        return
+    with _state_lock, _shared_write_lock():
+        # Re-check under the locks: another thread may have initialized
+        # already, and another worker may have initialized and published
+        if app_state["initialized"]:
+            return
+        _sync_shared_locked()
+        if app_state["initialized"]:
+            return
         result = run_cpp_command("GET_ALL_CONCEPTS")
         if isinstance(result, list):
             app_state["concepts"] = result
+            app_state["_by_id"] = {c.get("id"): c for c in result}
             # Calculate realistic last_revised_day based on current memory strength
-            lambda_rate = 0.15  # Default decay rate
+            lambda_rate = _decay_rate
             # Start at day 30 to give room for realistic day calculations
             current_day = 30
             
-            for concept in app_state["concepts"]:
-                memory = concept.get("memory_strength", 1.0)
-                initial = concept.get("initial_weight", 1.0)  # Default to 1.0 if not set
-                
-                # If initial_weight is missing or equals memory, assume realistic initial based on memory
-                if "initial_weight" not in concept or initial == memory:
-                    # For low memory concepts, assume they started higher and decayed
-                    if memory < 0.5:
-                        initial = 0.85  # Assume started at 85%
-                    elif memory < 0.7:
-                        initial = 0.90  # Assume started at 90%
-                    else:
-                        initial = max(memory, 0.95)  # Assume started at 95% or current if higher
-                    concept["initial_weight"] = initial
-                
-                # Calculate days since revision based on decay
-                days_since = calculate_days_since_revision(memory, initial, lambda_rate)
-                # Set last_revised_day so that current_day - last_revised_day = days_since
-                concept["last_revised_day"] = current_day - days_since
-                # Ensure last_revised_day is not negative
-                concept["last_revised_day"] = max(0, concept["last_revised_day"])
-            
+            concepts = app_state["concepts"]
+            memory = np.asarray([c.get("memory_strength", 1.0) for c in concepts])
+            initial = np.asarray([c.get("initial_weight", 1.0) for c in concepts])
+            needs_estimate = np.asarray(
+                ["initial_weight" not in c for c in concepts], dtype=bool)
+
+            # Where initial_weight is missing or equals memory, assume a
+            # realistic initial based on memory: low-memory concepts started
+            # higher and decayed (85%/90%), others at 95% or current if higher.
+            # Branchless np.where masks instead of a per-concept if-chain.
+            needs_estimate |= initial == memory
+            assumed = np.where(memory < 0.5, 0.85,
+                               np.where(memory < 0.7, 0.90, np.maximum(memory, 0.95)))
+            initial = np.where(needs_estimate, assumed, initial)
+
+            # Calculate days since revision for all concepts in one batch, then
+            # set last_revised_day so that current_day - last_revised_day =
+            # days_since, clamped so it is not negative
+            days_since = decay_kernels.days_since_batch(memory, initial, lambda_rate)
+            last_revised = np.maximum(0, current_day - days_since)
+            for concept, weight, day in zip(concepts, initial, last_revised):
+                concept["initial_weight"] = float(weight)
+                concept["last_revised_day"] = int(day)
+
             # Set initial current day
             app_state["stats"]["currentDay"] = current_day
+            _rebuild_arrays()
         
         result = run_cpp_command("GET_STATS")
         if isinstance(result, dict) and "status" not in result:
@@ -96,22 +288,143 @@ def initialize_state():
                 app_state["stats"]["currentDay"] = 0
         
         app_state["initialized"] = True
+        _publish_shared()
 
-def run_cpp_command(command, data=""):
-    """Execute C++ backend command"""
+def _try_connect_daemon():
+    """One connect attempt against the daemon socket; None if it fails"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(5)
     try:
-        if data:
-            result = subprocess.run([CPP_EXECUTABLE, command, data], capture_output=True, text=True, timeout=5)
-        else:
-            result = subprocess.run([CPP_EXECUTABLE, command], capture_output=True, text=True, timeout=5)
+        sock.connect(DAEMON_SOCKET_PATH)
+        return sock
+    except OSError:
+        sock.close()
+        return None
 
-        if result.returncode != 0:
-            return {"status": "error", "message": result.stderr or "C++ executable returned error"}
+def _connect_daemon():
+    """Connect to the persistent C++ daemon, starting it if necessary
 
+    Daemon startup is serialized behind an exclusive file lock so that
+    several cold-starting workers cannot each spawn their own daemon and
+    leave all but the last-bound one as orphans holding divergent state.
+    The spawned Popen handle is kept so the child gets reaped (and
+    restarted) if it dies.
+    """
+    global _daemon_proc
+    if not hasattr(socket, "AF_UNIX"):
+        return None  # No Unix sockets on this platform (e.g. Windows)
+
+    sock = _try_connect_daemon()
+    if sock is not None:
+        return sock
+
+    try:
+        with open(DAEMON_LOCK_PATH, "a+") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # Whoever held the lock before us may have bound the socket already
+            sock = _try_connect_daemon()
+            if sock is not None:
+                return sock
+            # poll() reaps a daemon we spawned earlier that has since died
+            if _daemon_proc is None or _daemon_proc.poll() is not None:
+                _daemon_proc = subprocess.Popen(
+                    [CPP_EXECUTABLE, "--serve", DAEMON_SOCKET_PATH],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            # Connect with backoff for about a second while the daemon binds
+            for delay in (0.02, 0.05, 0.1, 0.2, 0.3, 0.4):
+                time.sleep(delay)
+                sock = _try_connect_daemon()
+                if sock is not None:
+                    return sock
+    except OSError:
+        pass
+    return None
+
+def _daemon_request(sock, command, data):
+    """Send one newline-framed command to the daemon and read the response line"""
+    message = f"{command} {data}\n" if data else f"{command}\n"
+    sock.sendall(message.encode())
+    buffer = b""
+    while not buffer.endswith(b"\n"):
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ConnectionError("Daemon closed the connection")
+        buffer += chunk
+    return _json_loads(buffer)
+
+def _pipe_request(command, data):
+    """Send one command over the persistent stdin/stdout pipe transport
+
+    The binary's no-argument mode already reads newline-framed
+    "COMMAND data" lines and answers one JSON line per command, so the
+    same child can serve every request. Restarted on EOF/crash.
+    """
+    global _pipe_proc
+    if _pipe_proc is None or _pipe_proc.poll() is not None:
+        _pipe_proc = subprocess.Popen([CPP_EXECUTABLE],
+                                      stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      text=True, bufsize=1)
+    message = f"{command} {data}\n" if data else f"{command}\n"
+    _pipe_proc.stdin.write(message)
+    _pipe_proc.stdin.flush()
+    line = _pipe_proc.stdout.readline()
+    if not line:
+        raise ConnectionError("C++ backend closed its stdout")
+    return _json_loads(line)
+
+def _run_persistent(command, data=""):
+    """Try the persistent transports; returns None if neither is usable
+
+    Both answer in microseconds, so it is fine to call this inline from
+    sync and async handlers alike.
+    """
+    global _daemon_socket, _pipe_proc
+
+    # Fast path: persistent daemon over a cached Unix domain socket
+    with _daemon_lock:
+        if _daemon_socket is None:
+            _daemon_socket = _connect_daemon()
+        if _daemon_socket is not None:
+            try:
+                return _daemon_request(_daemon_socket, command, data)
+            except (OSError, ValueError):
+                # Stale or broken connection; drop it and fall back
+                try:
+                    _daemon_socket.close()
+                except OSError:
+                    pass
+                _daemon_socket = None
+
+        # Middle tier: long-lived child process with pipes
         try:
-            return json.loads(result.stdout)
-        except json.JSONDecodeError as e:
-            return {"status": "error", "message": f"Invalid JSON from C++ backend: {e}. Output: {result.stdout[:100]}"}
+            return _pipe_request(command, data)
+        except (OSError, ValueError):
+            if _pipe_proc is not None:
+                _pipe_proc.kill()
+                _pipe_proc = None
+    return None
+
+def _parse_subprocess_output(returncode, stdout, stderr):
+    """Turn one-shot subprocess output into the usual response dict/list"""
+    if returncode != 0:
+        return {"status": "error", "message": stderr or "C++ executable returned error"}
+    try:
+        return _json_loads(stdout)
+    except ValueError as e:
+        return {"status": "error", "message": f"Invalid JSON from C++ backend: {e}. Output: {stdout[:100]}"}
+
+def run_cpp_command(command, data=""):
+    """Execute C++ backend command"""
+    result = _run_persistent(command, data)
+    if result is not None:
+        return result
+
+    # Fallback: one-shot subprocess per command
+    try:
+        argv = [CPP_EXECUTABLE, command, data] if data else [CPP_EXECUTABLE, command]
+        result = subprocess.run(argv, capture_output=True, text=True, timeout=5)
+        return _parse_subprocess_output(result.returncode, result.stdout, result.stderr)
     except FileNotFoundError:
         return {"status": "error", "message": f"C++ executable not found: {CPP_EXECUTABLE}. Please compile main.cpp first."}
     except subprocess.TimeoutExpired:
@@ -119,136 +432,195 @@ def run_cpp_command(command, data=""):
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+async def run_cpp_command_async(command, data=""):
+    """Async variant of run_cpp_command for async handlers
+
+    The one-shot fallback can block for up to the 5 s timeout; awaiting it
+    through asyncio lets the event loop serve other work in the meantime
+    instead of stalling the whole worker on a slow backend call.
+    """
+    result = _run_persistent(command, data)
+    if result is not None:
+        return result
+
+    # Fallback: one-shot subprocess per command, awaited instead of blocking
+    try:
+        argv = [CPP_EXECUTABLE, command, data] if data else [CPP_EXECUTABLE, command]
+        proc = await asyncio.create_subprocess_exec(
+            *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=5)
+        except asyncio.TimeoutError:
+            proc.kill()
+            return {"status": "error", "message": "C++ backend timed out"}
+        return _parse_subprocess_output(proc.returncode, stdout.decode(), stderr.decode())
+    except FileNotFoundError:
+        return {"status": "error", "message": f"C++ executable not found: {CPP_EXECUTABLE}. Please compile main.cpp first."}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
 def find_concept_by_id(concept_id):
     """Find a concept in the state by ID"""
-    for concept in app_state["concepts"]:
-        if concept.get("id") == concept_id:
-            return concept
-    return None
+    return app_state["_by_id"].get(concept_id)
 
 def update_concept_in_state(concept_id, updates):
     """Update a concept in the state"""
-    for i, concept in enumerate(app_state["concepts"]):
-        if concept.get("id") == concept_id:
-            app_state["concepts"][i].update(updates)
-            return True
-    return False
+    concept = app_state["_by_id"].get(concept_id)
+    if concept is None:
+        return False
+    concept.update(updates)
+    return True
 
 def add_concept_to_state(concept_data):
     """Add a new concept to the state"""
     app_state["concepts"].append(concept_data)
-    # Update stats
-    app_state["stats"]["totalConcepts"] = len(app_state["concepts"])
-    # Recalculate average memory
-    if app_state["concepts"]:
-        total_memory = sum(c.get("memory_strength", 0) for c in app_state["concepts"])
-        app_state["stats"]["avgMemory"] = (total_memory / len(app_state["concepts"])) * 100
+    app_state["_by_id"][concept_data["id"]] = concept_data
+    # Stats and the revision queue refresh lazily via the dirty flag
+    _rebuild_arrays()
 
 @app.route('/api/concepts', methods=['GET'])
 def get_all_concepts():
-    initialize_state()
-    return jsonify(app_state["concepts"])
+    _sync_shared()
+    etag = _current_etag()
+    if _not_modified(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(app_state["concepts"])
+    response.set_etag(etag)
+    return response
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
-    initialize_state()
-    # Recalculate stats from current state
-    if app_state["concepts"]:
-        total_memory = sum(c.get("memory_strength", 0) for c in app_state["concepts"])
-        app_state["stats"]["totalConcepts"] = len(app_state["concepts"])
-        app_state["stats"]["avgMemory"] = (total_memory / len(app_state["concepts"])) * 100
-        app_state["stats"]["urgentCount"] = sum(1 for c in app_state["concepts"] if c.get("memory_strength", 0) < 0.3)
-    return jsonify(app_state["stats"])
+    _sync_shared()
+    etag = _current_etag()
+    if _not_modified(etag):
+        response = app.response_class(status=304)
+    else:
+        _refresh_derived()
+        response = jsonify(app_state["stats"])
+    response.set_etag(etag)
+    return response
 
 @app.route('/api/revision-queue', methods=['GET'])
 def get_revision_queue():
-    initialize_state()
-    # Return all concepts sorted by memory strength (lowest first)
-    queue = sorted(app_state["concepts"], key=lambda x: x.get("memory_strength", 0))
-    return jsonify(queue)
+    _sync_shared()
+    etag = _current_etag()
+    if _not_modified(etag):
+        response = app.response_class(status=304)
+    else:
+        # Return all concepts sorted by memory strength (lowest first)
+        _refresh_derived()
+        response = jsonify(app_state["_queue"])
+    response.set_etag(etag)
+    return response
 
 @app.route('/api/revise/<concept_id>', methods=['POST'])
 def revise_concept(concept_id):
-    initialize_state()
-    concept = find_concept_by_id(concept_id)
-    if not concept:
-        return jsonify({"status": "error", "message": "Concept not found"})
-    
-    # Update concept memory strength (boost by 0.4, cap at 1.0)
-    current_memory = concept.get("memory_strength", 0)
-    new_memory = min(1.0, current_memory + 0.4)
-    
-    update_concept_in_state(concept_id, {
-        "memory_strength": new_memory,
-        "initial_weight": new_memory,
-        "last_revised_day": app_state["stats"].get("currentDay", 0)
-    })
-    
-    # Update total revisions
-    app_state["stats"]["totalRevisions"] = app_state["stats"].get("totalRevisions", 0) + 1
-    
+    with _state_lock, _shared_write_lock():
+        _sync_shared_locked()
+        concept = find_concept_by_id(concept_id)
+        if not concept:
+            return jsonify({"status": "error", "message": "Concept not found"})
+
+        # Update concept memory strength (boost by 0.4, cap at 1.0)
+        current_memory = concept.get("memory_strength", 0)
+        new_memory = min(1.0, current_memory + 0.4)
+
+        update_concept_in_state(concept_id, {
+            "memory_strength": new_memory,
+            "initial_weight": new_memory,
+            "last_revised_day": app_state["stats"].get("currentDay", 0)
+        })
+        _rebuild_arrays()
+
+        # Update total revisions
+        app_state["stats"]["totalRevisions"] = app_state["stats"].get("totalRevisions", 0) + 1
+        _publish_shared()
+
     return jsonify({"status": "success", "message": "Concept revised"})
 
 @app.route('/api/simulate', methods=['POST'])
 def simulate_time():
-    initialize_state()
     data = request.get_json()
     days = data.get('days', 1)
-    
-    # Update current day
-    app_state["stats"]["currentDay"] = app_state["stats"].get("currentDay", 0) + days
-    
-    # Apply memory decay to all concepts
-    lambda_rate = 0.15  # Default decay rate
-    current_day = app_state["stats"]["currentDay"]
-    
-    for concept in app_state["concepts"]:
-        days_since_revision = current_day - concept.get("last_revised_day", 0)
-        initial_weight = concept.get("initial_weight", 1.0)
-        decay = initial_weight * math.exp(-lambda_rate * days_since_revision)  # e^(-lambda * days)
-        concept["memory_strength"] = max(0.1, min(1.0, decay))
-    
+
+    with _state_lock, _shared_write_lock():
+        _sync_shared_locked()
+        # Update current day
+        app_state["stats"]["currentDay"] = app_state["stats"].get("currentDay", 0) + days
+
+        # Apply memory decay to all concepts in one table-driven pass
+        current_day = app_state["stats"]["currentDay"]
+
+        if app_state["concepts"]:
+            memory = decay_kernels.decay_batch_table(
+                app_state["_initial_weight"], app_state["_last_revised_day"],
+                current_day, _decay_rate, _decay_table)
+            app_state["_memory_strength"] = memory
+            for concept, strength in zip(app_state["concepts"], memory):
+                concept["memory_strength"] = float(strength)
+            app_state["_dirty"] = True
+        app_state["_rev"] += 1
+        _publish_shared()
+
     return jsonify({"status": "success", "days": days})
 
 @app.route('/api/concepts', methods=['POST'])
 def add_concept():
-    initialize_state()
     data = request.get_json()
     name = data.get('name', '')
     concept_id = data.get('id', '')
     category = data.get('category', '')
     prerequisites = data.get('prerequisites', [])
     
-    # Check if concept already exists
-    if find_concept_by_id(concept_id):
-        return jsonify({"status": "error", "message": "Concept with this ID already exists"})
-    
-    # Create new concept (newly added, so last_revised_day = current_day)
-    current_day = app_state["stats"].get("currentDay", 0)
-    new_concept = {
-        "name": name,
-        "id": concept_id,
-        "category": category,
-        "initial_weight": 1.0,
-        "memory_strength": 1.0,
-        "last_revised_day": current_day,  # Just added, so revised today
-        "prerequisites": prerequisites
-    }
-    
-    add_concept_to_state(new_concept)
+    with _state_lock, _shared_write_lock():
+        _sync_shared_locked()
+        # Check if concept already exists
+        if find_concept_by_id(concept_id):
+            return jsonify({"status": "error", "message": "Concept with this ID already exists"})
+
+        # Create new concept (newly added, so last_revised_day = current_day)
+        current_day = app_state["stats"].get("currentDay", 0)
+        new_concept = {
+            "name": name,
+            "id": concept_id,
+            "category": category,
+            "initial_weight": 1.0,
+            "memory_strength": 1.0,
+            "last_revised_day": current_day,  # Just added, so revised today
+            "prerequisites": prerequisites
+        }
+
+        add_concept_to_state(new_concept)
+        _publish_shared()
+
     return jsonify({"status": "success", "message": "Concept added"})
 
 @app.route('/api/decay-rate', methods=['POST'])
-def set_decay_rate():
+async def set_decay_rate():
+    global _decay_rate, _decay_table
     data = request.get_json()
-    rate = data.get('rate', 0.15)
-    result = run_cpp_command("SET_DECAY_RATE", str(rate))
+    try:
+        rate = float(data.get('rate', DEFAULT_DECAY_RATE))
+    except (TypeError, ValueError):
+        return jsonify({"status": "error", "message": "Invalid decay rate"})
+    result = await run_cpp_command_async("SET_DECAY_RATE", str(rate))
+    if isinstance(result, dict) and result.get("status") == "success":
+        with _state_lock, _shared_write_lock():
+            # Sync first so the publish below carries fresh concepts/stats
+            _sync_shared_locked()
+            _decay_rate = rate
+            _decay_table = decay_kernels.build_decay_table(rate)
+            _publish_shared()  # Share the new rate with other workers
     return jsonify(result)
 
-# Serve static files (HTML, CSS, JS)
+# Serve static files (HTML, CSS, JS). conditional=True lets the browser
+# revalidate with If-Modified-Since and get cheap 304s; max_age lets it skip
+# the request entirely for an hour. In production, front these with nginx
+# (see README) so static fetches never reach Python at all.
 @app.route('/')
 def index():
-    return send_from_directory('.', 'index.html')
+    return send_from_directory('.', 'index.html', conditional=True)
 
 @app.route('/<path:filename>')
 def static_files(filename):
@@ -257,9 +629,19 @@ def static_files(filename):
     if filename.startswith('api/'):
         return {"status": "error", "message": "API endpoint not found"}, 404
     if filename.endswith(('.css', '.js', '.html')):
-        return send_from_directory('.', filename)
+        return send_from_directory('.', filename, conditional=True, max_age=3600)
     return {"status": "error", "message": "File not found"}, 404
 
+# Warm the state at import time (covers gunicorn worker forks as well as the
+# dev server) so the first request does not pay initialization latency and
+# handlers do not need a per-request initialized check. Backend errors are
+# already absorbed inside run_cpp_command; anything else should not make the
+# module unimportable.
+try:
+    initialize_state()
+except Exception:
+    pass
+
 if __name__ == '__main__':
     print("Starting Memory-Retention Learning System API on http://localhost:5000")
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+JIT-compiled batch kernels for the memory decay math in api.py
+
+When numba is available the kernels compile to native code (cached on disk
+to avoid paying the JIT startup cost on every run) and parallelize over the
+concept index. Without numba they fall back to equivalent vectorized NumPy,
+so the API works either way.
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# days_since_revision is integral in practice, so exp(-lambda * days) only
+# ever takes TABLE_SIZE distinct values per decay rate; a precomputed table
+# turns the per-concept exp into a lookup
+TABLE_SIZE = 1024
+
+
+def build_decay_table(lambda_rate, size=TABLE_SIZE):
+    """Precompute exp(-lambda * days) for integer days in [0, size)"""
+    return np.exp(-lambda_rate * np.arange(size))
+
+
+def decay_batch_table(initial_weight, last_revised_day, current_day, lambda_rate, table):
+    """Table-driven decay_batch: exact for integer days covered by the table
+
+    Days outside [0, len(table)) — a future last_revised_day or extreme age —
+    are delegated to decay_batch, so those elements match it by construction.
+    """
+    days = np.rint(current_day - last_revised_day).astype(np.int64)
+    clipped = np.clip(days, 0, len(table) - 1)
+    result = np.clip(initial_weight * table[clipped], 0.1, 1.0)
+    out_of_range = days != clipped
+    if out_of_range.any():
+        fallback = decay_batch(initial_weight, last_revised_day, current_day, lambda_rate)
+        result = np.where(out_of_range, fallback, result)
+    return result
+
+
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def decay_batch(initial_weight, last_revised_day, current_day, lambda_rate):
+        """Compute clamped memory strength for every concept at current_day"""
+        n = initial_weight.shape[0]
+        memory = np.empty(n, dtype=np.float64)
+        for i in prange(n):
+            days = current_day - last_revised_day[i]
+            decay = initial_weight[i] * math.exp(-lambda_rate * days)
+            memory[i] = min(1.0, max(0.1, decay))
+        return memory
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def days_since_batch(memory_strength, initial_weight, lambda_rate):
+        """Invert the decay formula: days since revision for every concept
+
+        Element-wise version of the old calculate_days_since_revision helper,
+        including its edge cases (recently-revised high memory, assumed 1.0
+        initial, fully decayed memory).
+        """
+        n = memory_strength.shape[0]
+        days = np.empty(n, dtype=np.int64)
+        for i in prange(n):
+            memory = memory_strength[i]
+            initial = initial_weight[i]
+            if initial <= 0:
+                days[i] = 0  # Invalid initial weight
+                continue
+            if memory >= initial:
+                if memory >= 0.9:
+                    days[i] = 0  # Just revised
+                    continue
+                initial = 1.0  # Assume it started at 1.0 and decayed slightly
+            ratio = memory / initial
+            if ratio <= 0:
+                days[i] = 999  # Very old (memory decayed to near zero)
+                continue
+            # memory = initial * exp(-lambda * days)  =>  days = -ln(ratio) / lambda
+            days[i] = max(0, int(round(-math.log(ratio) / lambda_rate)))
+        return days
+else:
+    def decay_batch(initial_weight, last_revised_day, current_day, lambda_rate):
+        """Compute clamped memory strength for every concept at current_day"""
+        days = current_day - last_revised_day
+        decay = initial_weight * np.exp(-lambda_rate * days)
+        return np.clip(decay, 0.1, 1.0)
+
+    def days_since_batch(memory_strength, initial_weight, lambda_rate):
+        """Invert the decay formula: days since revision for every concept"""
+        initial = np.where(
+            (memory_strength >= initial_weight) & (memory_strength < 0.9),
+            1.0, initial_weight)
+        ratio = memory_strength / np.where(initial > 0, initial, 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            days = -np.log(ratio) / lambda_rate
+        days = np.where(ratio <= 0, 999.0, days)  # Very old (decayed to near zero)
+        days = np.maximum(0, np.round(days)).astype(np.int64)
+        # Recently revised or invalid initial weight means zero days
+        days = np.where((memory_strength >= initial_weight) & (memory_strength >= 0.9), 0, days)
+        days = np.where(initial_weight <= 0, 0, days)
+        return days
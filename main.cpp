@@ -8,6 +8,16 @@
 #include <iomanip>
 #include <stdexcept>
 
+#ifndef _WIN32
+#include <sys/socket.h>
+#include <sys/un.h>
+#include <unistd.h>
+#include <cstring>
+#include <csignal>
+#include <thread>
+#include <mutex>
+#endif
+
 // ============================================================================
 // DATA STRUCTURE 1: CONCEPT (Node Structure)
 // ============================================================================
@@ -376,25 +386,26 @@ void initializeSampleData() {
     memoryGraph->insertConcept("Dynamic Programming", "dp", "Algorithms", 0.90, {"sorting"});
 }
 
-void processCommand(const std::string& command, const std::string& data) {
+std::string processCommand(const std::string& command, const std::string& data) {
+    std::ostringstream out;
     try {
         if (command == "GET_ALL_CONCEPTS") {
-            std::cout << memoryGraph->toJSON() << std::endl;
+            out << memoryGraph->toJSON();
         }
         else if (command == "GET_STATS") {
-            std::cout << memoryGraph->getStatsJSON() << std::endl;
+            out << memoryGraph->getStatsJSON();
         }
         else if (command == "GET_REVISION_QUEUE") {
-            std::cout << memoryGraph->getRevisionQueueJSON(10) << std::endl;
+            out << memoryGraph->getRevisionQueueJSON(10);
         }
         else if (command == "REVISE_CONCEPT") {
             memoryGraph->reviseConcept(data);
-            std::cout << "{\"status\":\"success\",\"message\":\"Concept revised\"}" << std::endl;
+            out << "{\"status\":\"success\",\"message\":\"Concept revised\"}";
         }
         else if (command == "SIMULATE_TIME") {
             int days = std::stoi(data);
             memoryGraph->simulateTimePassage(days);
-            std::cout << "{\"status\":\"success\",\"days\":" << days << "}" << std::endl;
+            out << "{\"status\":\"success\",\"days\":" << days << "}";
         }
         else if (command == "ADD_CONCEPT") {
             std::istringstream iss(data);
@@ -414,30 +425,118 @@ void processCommand(const std::string& command, const std::string& data) {
             }
 
             memoryGraph->insertConcept(name, id, category, 1.0, prerequisites);
-            std::cout << "{\"status\":\"success\",\"message\":\"Concept added\"}" << std::endl;
+            out << "{\"status\":\"success\",\"message\":\"Concept added\"}";
         }
         else if (command == "SET_DECAY_RATE") {
             double rate = std::stod(data);
             memoryGraph->setDecayRate(rate);
             memoryGraph->updateMemoryStrengths();
-            std::cout << "{\"status\":\"success\",\"rate\":" << rate << "}" << std::endl;
+            out << "{\"status\":\"success\",\"rate\":" << rate << "}";
         }
         else {
-            std::cout << "{\"status\":\"error\",\"message\":\"Unknown command\"}" << std::endl;
+            out << "{\"status\":\"error\",\"message\":\"Unknown command\"}";
         }
     }
     catch (const std::exception& e) {
-        std::cout << "{\"status\":\"error\",\"message\":\"" << e.what() << "\"}" << std::endl;
+        out.str("");
+        out << "{\"status\":\"error\",\"message\":\"" << e.what() << "\"}";
+    }
+    return out.str();
+}
+
+#ifndef _WIN32
+// Serializes command dispatch across client threads; the graph and heap
+// are not thread-safe
+std::mutex commandMutex;
+
+// One client connection: read newline-framed "COMMAND data" requests and
+// answer one JSON line each, until the client disconnects
+void handleClient(int client_fd) {
+    std::string buffer;
+    char chunk[4096];
+    ssize_t n;
+    while ((n = read(client_fd, chunk, sizeof(chunk))) > 0) {
+        buffer.append(chunk, n);
+        size_t newline;
+        while ((newline = buffer.find('\n')) != std::string::npos) {
+            std::string line = buffer.substr(0, newline);
+            buffer.erase(0, newline + 1);
+            if (line.empty() || line == "EXIT") {
+                close(client_fd);
+                return;
+            }
+            size_t pos = line.find(' ');
+            std::string command = line.substr(0, pos);
+            std::string data = (pos != std::string::npos) ? line.substr(pos + 1) : "";
+            std::string response;
+            {
+                std::lock_guard<std::mutex> guard(commandMutex);
+                response = processCommand(command, data) + "\n";
+            }
+            if (write(client_fd, response.c_str(), response.size()) < 0) {
+                close(client_fd);
+                return;
+            }
+        }
+    }
+    close(client_fd);
+}
+
+// Long-running server mode: accept connections on a Unix domain socket and
+// answer newline-framed "COMMAND data" requests (same protocol as the
+// interactive stdin loop). Lets the Python API keep one connection open
+// instead of paying fork/exec + linker startup for every command. Each
+// client gets its own thread so several gunicorn workers can hold their
+// cached connections open concurrently.
+int runSocketServer(const std::string& socket_path) {
+    signal(SIGPIPE, SIG_IGN);
+
+    int server_fd = socket(AF_UNIX, SOCK_STREAM, 0);
+    if (server_fd < 0) {
+        std::cerr << "Failed to create socket" << std::endl;
+        return 1;
+    }
+
+    sockaddr_un addr;
+    std::memset(&addr, 0, sizeof(addr));
+    addr.sun_family = AF_UNIX;
+    std::strncpy(addr.sun_path, socket_path.c_str(), sizeof(addr.sun_path) - 1);
+    unlink(socket_path.c_str());
+
+    if (bind(server_fd, (sockaddr*)&addr, sizeof(addr)) < 0 ||
+        listen(server_fd, 8) < 0) {
+        std::cerr << "Failed to bind/listen on " << socket_path << std::endl;
+        close(server_fd);
+        return 1;
     }
+
+    while (true) {
+        int client_fd = accept(server_fd, nullptr, nullptr);
+        if (client_fd < 0) continue;
+        std::thread(handleClient, client_fd).detach();
+    }
+
+    close(server_fd);
+    return 0;
 }
+#endif
 
 int main(int argc, char* argv[]) {
     initializeSampleData();
 
+#ifndef _WIN32
+    if (argc > 1 && std::string(argv[1]) == "--serve") {
+        std::string socket_path = (argc > 2) ? argv[2] : "/tmp/memory_graph.sock";
+        int status = runSocketServer(socket_path);
+        delete memoryGraph;
+        return status;
+    }
+#endif
+
     if (argc > 1) {
         std::string command = argv[1];
         std::string data = (argc > 2) ? argv[2] : "";
-        processCommand(command, data);
+        std::cout << processCommand(command, data) << std::endl;
     }
     else {
         std::string line;
@@ -446,7 +545,7 @@ int main(int argc, char* argv[]) {
             size_t pos = line.find(' ');
             std::string command = line.substr(0, pos);
             std::string data = (pos != std::string::npos) ? line.substr(pos + 1) : "";
-            processCommand(command, data);
+            std::cout << processCommand(command, data) << std::endl;
             std::cout.flush();
         }
     }
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Cross-worker shared state for the concept arrays in api.py
+
+Under gunicorn each worker is a separate process; without sharing, every
+worker would pay its own initialize_state() round-trip to the C++ backend
+and mutations in one worker would be invisible to the others. This module
+keeps the canonical numeric state (the three float64 SoA arrays) in a
+named multiprocessing.shared_memory segment, fronted by a small header
+holding a revision counter and the concept count. Rarely-changing
+metadata (names, ids, categories, prerequisites, stats) goes to a JSON
+file next to the segment and is reloaded only when the counter moves.
+
+Layout of the segment:
+
+    [rev: int64][count: int64][initial_weight: f64 * CAPACITY]
+    [last_revised_day: f64 * CAPACITY][memory_strength: f64 * CAPACITY]
+
+Writes take an exclusive file lock, reads a shared one, so a reader never
+sees a torn update; mutating callers must additionally hold write_lock()
+across their whole sync-mutate-publish cycle, or concurrent workers lose
+updates to the read-modify-write race. On Windows (no fcntl) locking
+degrades to a no-op, which is fine for the single-process dev server.
+
+The named segment outlives individual workers so gunicorn can recycle
+them freely; remove it at deployment shutdown with
+
+    python3 -c "import shared_state; shared_state.SharedConceptState().unlink()"
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import tempfile
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: single-process dev server, locking not needed
+
+SEGMENT_NAME = "memory_graph_state"
+CAPACITY = 4096  # Max concepts held in the shared arrays
+_HEADER_BYTES = 16  # Two int64 slots: revision counter, concept count
+
+
+class SharedConceptState:
+    """Attach to (or create) the shared segment for the concept arrays"""
+
+    def __init__(self, name=SEGMENT_NAME, capacity=CAPACITY):
+        size = _HEADER_BYTES + 3 * capacity * 8
+        self.capacity = capacity
+        self._meta_path = os.path.join(tempfile.gettempdir(), f"{name}_meta.json")
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock_file = None
+        self._lock_count = 0
+        self._shm = None
+        for _ in range(2):
+            try:
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+                self._header_view()[:] = 0
+                break
+            except FileExistsError:
+                existing = shared_memory.SharedMemory(name=name)
+                if existing.size >= size:
+                    self._shm = existing
+                    break
+                # Stale segment from an older, smaller layout: replace it
+                existing.close()
+                existing.unlink()
+        if self._shm is None:
+            raise OSError(f"Could not create or attach shared segment {name}")
+        # The named segment deliberately outlives any one worker (gunicorn
+        # recycles them); its lifetime ends only with an explicit unlink()
+        # at deployment shutdown or a host reboot. Opt out of
+        # resource_tracker's per-process cleanup so no worker exit (or its
+        # shutdown warning about "leaked" segments) tears the segment down
+        # under the surviving workers.
+        try:
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        except Exception:
+            pass
+        atexit.register(self.close)
+
+    def _header_view(self):
+        return np.ndarray((2,), dtype=np.int64, buffer=self._shm.buf[:_HEADER_BYTES])
+
+    def _array_view(self, slot):
+        start = _HEADER_BYTES + slot * self.capacity * 8
+        return np.ndarray((self.capacity,), dtype=np.float64,
+                          buffer=self._shm.buf[start:start + self.capacity * 8])
+
+    def _acquire(self, flag):
+        """Take the cross-process file lock (re-entrant within a process)
+
+        Nested acquires piggyback on the already-held lock: publish() and
+        snapshot() called inside write_lock() reuse its exclusive hold.
+        api.py only calls in here under its own state lock, so the depth
+        counter needs no thread guard of its own.
+        """
+        if self._lock_count == 0:
+            lock_file = open(self._lock_path, "a+")
+            if fcntl is not None:
+                fcntl.flock(lock_file, flag)
+            self._lock_file = lock_file
+        self._lock_count += 1
+
+    def _release(self):
+        self._lock_count -= 1
+        if self._lock_count == 0:
+            self._lock_file.close()
+            self._lock_file = None
+
+    @contextlib.contextmanager
+    def write_lock(self):
+        """Hold the exclusive lock across a whole sync-mutate-publish cycle
+
+        The locking inside publish()/snapshot() only prevents torn frames.
+        A mutation is a read-modify-write against the shared state, so the
+        exclusive lock has to span syncing in the latest revision, applying
+        the change, and publishing — otherwise two workers mutating
+        concurrently overwrite each other's updates.
+        """
+        self._acquire(fcntl.LOCK_EX if fcntl is not None else 0)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @property
+    def rev(self):
+        """Current revision counter (bumped on every publish)"""
+        return int(self._header_view()[0])
+
+    def publish(self, initial_weight, last_revised_day, memory_strength, metadata):
+        """Write arrays + metadata and bump the revision counter
+
+        Returns the new revision so the caller can remember what it has seen.
+        """
+        count = len(memory_strength)
+        if count > self.capacity:
+            raise ValueError(f"Too many concepts for shared segment: {count} > {self.capacity}")
+        self._acquire(fcntl.LOCK_EX if fcntl is not None else 0)
+        try:
+            self._array_view(0)[:count] = initial_weight
+            self._array_view(1)[:count] = last_revised_day
+            self._array_view(2)[:count] = memory_strength
+            # Write-then-rename so readers never see a partial metadata file
+            tmp_path = self._meta_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(metadata, f)
+            os.replace(tmp_path, self._meta_path)
+            header = self._header_view()
+            header[1] = count
+            header[0] += 1
+            return int(header[0])
+        finally:
+            self._release()
+
+    def snapshot(self):
+        """Read (rev, initial_weight, last_revised_day, memory_strength, metadata)
+
+        Arrays are copies, safe to use after the lock is released. Returns
+        None if nothing has been published yet.
+        """
+        self._acquire(fcntl.LOCK_SH if fcntl is not None else 0)
+        try:
+            header = self._header_view()
+            rev, count = int(header[0]), int(header[1])
+            if rev == 0:
+                return None
+            try:
+                with open(self._meta_path) as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError):
+                return None
+            return (rev,
+                    self._array_view(0)[:count].copy(),
+                    self._array_view(1)[:count].copy(),
+                    self._array_view(2)[:count].copy(),
+                    metadata)
+        finally:
+            self._release()
+
+    def close(self):
+        """Detach this process's mapping; the named segment stays in place
+
+        Workers come and go under gunicorn (--max-requests, crashes, HUP),
+        so tying the segment's lifetime to any one of them would leave
+        survivors publishing to an orphaned inode while a replacement
+        worker re-creates an empty segment and diverges. Use unlink() from
+        a deployment shutdown hook to actually remove the segment.
+        """
+        try:
+            self._shm.close()
+        except (OSError, BufferError):
+            pass
+
+    def unlink(self):
+        """Remove the named segment and its metadata/lock files
+
+        Call once at deployment shutdown (e.g. a gunicorn on_exit hook or
+        an ops script), never from a worker's own exit path.
+        """
+        # Re-register first: __init__ opted out of resource_tracker, and
+        # unlink() below sends an unregister the tracker must know about
+        try:
+            resource_tracker.register(self._shm._name, "shared_memory")
+        except Exception:
+            pass
+        try:
+            self._shm.unlink()
+        except OSError:
+            pass
+        for path in (self._meta_path, self._lock_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for production servers
+
+The built-in Flask dev server (python api.py) handles one request at a
+time, so every request queues behind any in-flight C++ backend call.
+Run under gunicorn instead so requests overlap:
+
+    gunicorn -k gevent -w 4 -b 0.0.0.0:5000 wsgi:app
+"""
+
+from api import app
+
+if __name__ == "__main__":
+    app.run(host="0.0.0.0", port=5000)